@@ -1,30 +1,237 @@
 import os
 import asyncio
 import logging
-import json
 import time
 import hmac
 import hashlib
-from datetime import datetime, timedelta
+import html
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from operator import itemgetter
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Tuple
 import aiohttp
+import orjson
 from aiohttp import web
 from aiohttp.web import Request, Response, json_response
-import requests
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
+CHAT_QUEUE_IDLE_TIMEOUT = 300  # Seconds before an idle per-chat queue is dropped
+CHAT_QUEUE_MAXSIZE = 16        # Pending updates held per chat before new ones are refused
+SPOT_CACHE_TTL = 3.0           # Seconds a fetched BTC spot price stays fresh
+ORDERS_CACHE_TTL = 2.0         # Seconds an open-orders snapshot stays fresh
+BLOCKING_POOL_WORKERS = 8      # Threads for asyncio.to_thread work
+PRESS_DEBOUNCE = 1.0           # Seconds within which a repeated button press is ignored
+POSITIONS_RENDER_LIMIT = 10    # Most recent tracked positions shown in a listing
+DELTA_RATE_LIMIT = 10.0        # Delta API requests started per second, sustained
+DELTA_RATE_BURST = 20          # Delta API requests that may start back to back
+TELEGRAM_GLOBAL_RATE = 30.0    # Bot API messages per second across all chats
+TELEGRAM_CHAT_RATE = 1.0       # Bot API messages per second within one chat, sustained
+TELEGRAM_CHAT_BURST = 3        # Messages one chat may receive back to back
+SPOT_REFRESH_INTERVAL = 2      # Seconds between background spot price refreshes
+SPOT_REFRESH_IDLE = 60         # Stop background refreshes after this long without readers
+
+_ERROR_TEMPLATE = "❌ {title}: {detail}"
+
+# Fixed one-line replies and button toasts
+_LOADING_TEXT = "⏳ Loading..."
+_UNKNOWN_ACTION_TEXT = "❌ Unknown action."
+_EXECUTING_TEXT = "⚡ Executing Enhanced Short Straddle Strategy..."
+_NO_SPOT_TEXT = "❌ Failed to get BTC spot price"
+_NO_ATM_OPTIONS_TEXT = ("❌ No ATM options found for short-term expiry\n\n"
+                        "💡 BTC options may not be available for same-day trading")
+_NO_BREAK_EVEN_TEXT = "❌ Could not calculate break-even price"
+_REPEAT_PRESS_TOAST = "⏳ Please wait..."
+_BUSY_TOAST = "⏳ Busy, try again shortly"
+
+
+# Per-leg lines in the straddle execution summary
+_LEG_FAILED_TMPL = "❌ {label} Option failed: {error}"
+_LEG_SOLD_TMPL = "✅ {label} Option Sold: {symbol} @ ${premium:.1f}"
+_LEG_STOP_TMPL = "🛡️ {label} Stop-Loss placed at ${stop:.1f}"
+_LEG_STOP_FAILED_TMPL = "⚠️ {label} Stop-Loss failed: {error}"
+
+# The straddle leg left open when the other leg's stop fires
+_OTHER_LEG = {'call': 'put', 'put': 'call'}
+
+# Position statuses that still hold open exposure
+_LIVE_STATUSES = frozenset({'active', 'adjusting', 'break_even_adjusted'})
+
+# Text commands and inline button data mapped to their TelegramBot handler methods
+_COMMANDS = (
+    ('/start', '_start_command'),
+    ('/help', '_help_command'),
+    ('/status', '_status_command'),
+    ('/positions', '_positions_command'),
+)
+_CALLBACKS = (
+    ('execute_straddle', '_execute_straddle_callback'),
+    ('check_positions', '_check_positions_callback'),
+)
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize to compact JSON text with orjson"""
+    return orjson.dumps(obj).decode('utf-8')
+
+# Static bot replies, built once at import
+_MAIN_MENU_KEYBOARD = {
+    'inline_keyboard': [[
+        {'text': '🚀 Execute Short Straddle', 'callback_data': 'execute_straddle'}
+    ], [
+        {'text': '📊 Check Positions', 'callback_data': 'check_positions'}
+    ]]
+}
+# Serialized once; send_message passes reply_markup strings through untouched
+_MAIN_MENU_MARKUP = _json_dumps(_MAIN_MENU_KEYBOARD)
+
+_WELCOME_TEXT = (
+    "🤖 <b>Enhanced BTC Short Straddle Bot</b>\n\n"
+    "This bot executes a short straddle strategy with smart risk management:\n"
+    "• Sells 1 lot ATM Call & Put options\n"
+    "• Places 25% premium stop-loss orders\n"
+    "• <b>Auto break-even adjustment</b> when one stop triggers\n"
+    "• Continuous position monitoring\n\n"
+    "Click below to get started:"
+)
+
+_STATUS_TEMPLATE = (
+    "✅ <b>Enhanced Bot Status: Active</b>\n\n"
+    "🔗 Connected to Delta Exchange India\n"
+    "📊 Current BTC Price: ${spot:,.2f}\n"
+    "📈 Active Positions: {active}\n"
+    "🤖 Monitoring Tasks Running\n"
+    "⏰ Last Update: {now:%Y-%m-%d %H:%M:%S} UTC"
+)
+
+_HELP_TEXT = (
+    "📋 Enhanced Bot Commands:\n\n"
+    "/start - Show main menu\n"
+    "/help - Show this help message\n"
+    "/status - Check bot status\n"
+    "/positions - View active positions\n\n"
+    "Smart Features:\n"
+    "🎯 Auto break-even adjustment\n"
+    "📊 Real-time position monitoring\n"
+    "🛡️ Advanced risk management\n"
+    "⚡ Instant stop-loss notifications"
+)
+
+def _render_position_row(pid: str, status: str, created: datetime, stop_triggered: Optional[str]) -> str:
+    """One detailed listing row"""
+    if stop_triggered:
+        return (f"🆔 {pid}\n📍 Status: {status}\n⏰ Created: {created:%H:%M:%S}\n"
+                f"🚨 Stop Triggered: {stop_triggered.upper()}\n━━━━━━━━━━━━━━\n")
+    return f"🆔 {pid}\n📍 Status: {status}\n⏰ Created: {created:%H:%M:%S}\n━━━━━━━━━━━━━━\n"
+
+def _render_position_summary_row(pid: str, status: str) -> str:
+    """One compact listing row"""
+    return f"🆔 {pid:.12}...\n📍 {status}\n━━━━━━━━━━━━━━\n"
+
+def _format_positions(positions: Dict[str, Dict], compact: bool = False, hidden: int = 0) -> str:
+    """Render tracked positions for Telegram"""
+    if compact:
+        parts = ["📊 <b>Position Summary:</b>\n\n"]
+    else:
+        parts = ["📊 <b>Active Positions:</b>\n\n"]
+    
+    if not positions:
+        parts.append("No active positions")
+        return "".join(parts)
+    
+    # Decide the layout once rather than per row
+    if compact:
+        parts.extend(_render_position_summary_row(pid, pos['status'])
+                     for pid, pos in positions.items())
+    else:
+        parts.extend(_render_position_row(pid, pos['status'], pos['created_at'], pos.get('stop_triggered'))
+                     for pid, pos in positions.items())
+    
+    if hidden:
+        parts.append(f"… and {hidden} older position(s)")
+    
+    return "".join(parts)
+
+# Listings for an empty tracker, indexed by compact; the common case for a fresh bot
+_EMPTY_POSITIONS_TEXT = (_format_positions({}), _format_positions({}, compact=True))
+
+@dataclass(slots=True, frozen=True)
+class OptionProduct:
+    """A BTC option contract parsed once from /products"""
+    id: int
+    symbol: str
+    contract_type: str
+    strike_price: float
+    settlement: Optional[datetime]
+    
+    def as_option(self) -> Dict:
+        """Option dict in the shape handlers and the order tracker expect"""
+        return {'id': self.id, 'symbol': self.symbol, 'strike_price': self.strike_price,
+                'contract_type': self.contract_type}
+
+def _normalize_option_products(products_data: List[Dict]) -> List[OptionProduct]:
+    """Parse BTC option products once into OptionProduct rows"""
+    options = []
+    # Bound once for the loop, which runs over every listed option contract
+    append = options.append
+    fromisoformat = datetime.fromisoformat
+    # Every strike of an expiry shares one settlement string; parse each distinct one once
+    settlements: Dict[str, Optional[datetime]] = {}
+    for product in products_data:
+        if product['underlying_asset']['symbol'] != 'BTC':
+            continue
+            
+        settlement = None
+        settlement_time = product.get('settlement_time')
+        if settlement_time:
+            if settlement_time in settlements:
+                settlement = settlements[settlement_time]
+            else:
+                try:
+                    settlement = fromisoformat(settlement_time.replace('Z', '+00:00'))
+                    if settlement.tzinfo is None:
+                        settlement = settlement.replace(tzinfo=timezone.utc)
+                except (ValueError, TypeError):
+                    settlement = None
+                settlements[settlement_time] = settlement
+            if settlement is None:
+                # If we can't parse the date, skip this option
+                continue
+        
+        strike_price = float(product.get('strike_price', 0))
+        if strike_price == 0:
+            continue
+            
+        append(OptionProduct(product['id'], product['symbol'], product['contract_type'],
+                             strike_price, settlement))
+    return options
+
+def _esc(text: Any) -> str:
+    """Make dynamic text safe to embed in an HTML-mode message (quotes need no escaping)"""
+    return html.escape(str(text), quote=False)
+
+def _error_message(response: Dict) -> str:
+    """Human-readable reason from a failed Delta response (Delta often sends only an error code)"""
+    error = response.get('error') or {}
+    if isinstance(error, str):
+        return error
+    return error.get('message') or error.get('code') or 'Unknown error'
+
+def _client_order_id(chat_id: int, position_id: str, leg: str) -> str:
+    """Deterministic client order id so resubmitted orders are deduplicated by Delta"""
+    return f"{chat_id}-{position_id.rsplit('_', 1)[-1]}-{leg}"
+
 class OrderTracker:
     """Track and manage active orders and positions"""
     
     def __init__(self):
         self.active_positions: Dict[str, Dict] = {}  # Track active straddle positions
-        self.stop_orders: Dict[str, Dict] = {}       # Track stop-loss orders
         self.monitoring_tasks: Dict[str, asyncio.Task] = {}  # Monitoring tasks
         
     def add_position(self, position_id: str, call_data: Dict, put_data: Dict):
@@ -47,26 +254,69 @@ class OrderTracker:
             self.active_positions[position_id]['stop_triggered'] = option_type
             self.active_positions[position_id]['status'] = 'adjusting'
 
+class TokenBucket:
+    """Async token bucket pacing how often requests may start"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate                    # Tokens added per second
+        self.capacity = capacity            # Most tokens that can be saved up for a burst
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()         # Waiters are served in arrival order
+        
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    def is_idle(self) -> bool:
+        """True once the bucket has refilled completely, i.e. nobody has drawn from it lately"""
+        refilled = self._tokens + (time.monotonic() - self._updated) * self.rate
+        return refilled >= self.capacity and not self._lock.locked()
+
 class DeltaExchangeClient:
     """Enhanced Delta Exchange India API Client with order monitoring"""
     
     def __init__(self, api_key: str, api_secret: str):
         self.api_key = api_key
         self.api_secret = api_secret
+        self._secret_key = api_secret.encode('utf-8')  # HMAC key, encoded once
         self.base_url = "https://api.india.delta.exchange"
         self.session = None
+        self._request_sem = asyncio.Semaphore(8)  # Cap parallel Delta API calls
+        self._rate_limiter = TokenBucket(DELTA_RATE_LIMIT, DELTA_RATE_BURST)  # Cap Delta API call rate
+        self._options_cache: Optional[List[OptionProduct]] = None  # Parsed BTC option products
+        self._options_expires_at = 0.0
+        self._options_by_id: Dict[int, OptionProduct] = {}  # Same rows keyed by product id
         
     async def _get_session(self):
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
+        if self.session is None or self.session.closed:
+            # One pooled keep-alive session so TCP/TLS setup is paid once per connection
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=32, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=7)
+            )
         return self.session
     
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+    
     def _generate_signature(self, method: str, timestamp: str, path: str, 
                           query_string: str = "", payload: str = "") -> str:
         """Generate signature for Delta Exchange API"""
-        message = method + timestamp + path + query_string + payload
+        message = "".join((method, timestamp, path, query_string, payload))
         signature = hmac.new(
-            self.api_secret.encode('utf-8'),
+            self._secret_key,
             message.encode('utf-8'),
             hashlib.sha256
         ).hexdigest()
@@ -81,13 +331,12 @@ class DeltaExchangeClient:
         
         query_string = ""
         if params:
-            query_string = "&".join([f"{k}={v}" for k, v in params.items()])
-            if query_string:
-                query_string = "?" + query_string
+            query_string = "?" + "&".join(f"{k}={v}" for k, v in params.items())
         
         payload = ""
         if data:
-            payload = json.dumps(data)
+            # The exact string signed is the exact body sent
+            payload = _json_dumps(data)
         
         signature = self._generate_signature(method, timestamp, path, query_string, payload)
         
@@ -99,25 +348,17 @@ class DeltaExchangeClient:
             'Content-Type': 'application/json'
         }
         
-        url = f"{self.base_url}{path}"
-        if query_string:
-            url += query_string
+        url = f"{self.base_url}{path}{query_string}"
             
         try:
-            if method.upper() == 'GET':
-                async with session.get(url, headers=headers) as response:
-                    return await response.json()
-            elif method.upper() == 'POST':
-                async with session.post(url, headers=headers, data=payload) as response:
-                    return await response.json()
-            elif method.upper() == 'DELETE':
-                async with session.delete(url, headers=headers, data=payload) as response:
-                    return await response.json()
-            elif method.upper() == 'PUT':
-                async with session.put(url, headers=headers, data=payload) as response:
-                    return await response.json()
+            # GET requests carry no body; everything else sends the signed payload
+            async with self._request_sem:
+                await self._rate_limiter.acquire()
+                async with session.request(method.upper(), url, headers=headers,
+                                           data=payload or None) as response:
+                    return orjson.loads(await response.read())
         except Exception as e:
-            logger.error(f"API request failed: {e}")
+            logger.error("API request failed: %s", e)
             raise
     
     async def get_products(self, contract_type: str = None) -> Dict:
@@ -135,6 +376,14 @@ class DeltaExchangeClient:
         """Get order status"""
         return await self._make_request('GET', f'/orders/{order_id}')
     
+    async def get_open_orders(self) -> Dict:
+        """Get all open and pending (untriggered stop) orders"""
+        return await self._make_request('GET', '/orders', params={'states': 'open,pending'})
+    
+    async def get_order_by_client_id(self, client_order_id: str) -> Dict:
+        """Get an order by its client order id"""
+        return await self._make_request('GET', f'/orders/client_order_id/{client_order_id}')
+    
     async def get_position(self, product_id: int) -> Dict:
         """Get position for a product"""
         return await self._make_request('GET', f'/positions/margined/{product_id}')
@@ -166,95 +415,88 @@ class DeltaExchangeClient:
                 return float(ticker['result']['mark_price'])
             return 0.0
         except Exception as e:
-            logger.error(f"Failed to get spot price: {e}")
+            logger.error("Failed to get spot price: %s", e)
             return 0.0
     
+    async def get_option_products(self) -> Optional[List[OptionProduct]]:
+        """Get BTC option products parsed once, reusing them for a few minutes"""
+        if self._options_cache is not None and time.monotonic() < self._options_expires_at:
+            return self._options_cache
+        
+        products = await self._make_request('GET', '/products', {
+            'contract_types': 'call_options,put_options'
+        })
+        if not products.get('success'):
+            return None
+        
+        # Parsing every settlement timestamp is CPU work; keep it off the loop
+        self._options_cache = await asyncio.to_thread(_normalize_option_products, products['result'])
+        self._options_by_id = {option.id: option for option in self._options_cache}
+        self._options_expires_at = time.monotonic() + 300
+        return self._options_cache
+    
     async def find_atm_options(self, spot_price: float) -> Dict[str, Optional[Dict]]:
         """Find ATM call and put options for same day expiry"""
         try:
-            # Get all BTC options products
-            products = await self._make_request('GET', '/products', {
-                'contract_types': 'call_options,put_options'
-            })
-            
-            if not products.get('success'):
+            options = await self.get_option_products()
+            if options is None:
                 return {'call': None, 'put': None}
                 
-            return self._find_closest_expiry_options(products['result'], spot_price)
+            return self._find_closest_expiry_options(options, spot_price)
             
         except Exception as e:
-            logger.error(f"Failed to find ATM options: {e}")
+            logger.error("Failed to find ATM options: %s", e)
             return {'call': None, 'put': None}
 
-    def _find_closest_expiry_options(self, products_data: List[Dict], spot_price: float) -> Dict[str, Optional[Dict]]:
+    def _find_closest_expiry_options(self, options: List[OptionProduct], spot_price: float) -> Dict[str, Optional[Dict]]:
         """Find options with closest expiry (fallback method)"""
-        call_option = None
-        put_option = None
-        min_call_diff = float('inf')
-        min_put_diff = float('inf')
+        # Keep only the best contract per side during the scan; build result dicts once at the end
+        best = {'call_options': None, 'put_options': None}
+        min_diff = {'call_options': float('inf'), 'put_options': float('inf')}
+        now = datetime.now(timezone.utc)
         today = datetime.now().date()
         
-        for product in products_data:
-            if product['underlying_asset']['symbol'] != 'BTC':
+        for option in options:
+            contract_type = option.contract_type
+            if contract_type not in best:
                 continue
-                
-            # Check if it's a same-day or next-day expiry option
-            settlement_time = product.get('settlement_time')
-            if settlement_time:
-                try:
-                    # Parse settlement time and check if it's today or tomorrow
-                    settlement_date = datetime.fromisoformat(settlement_time.replace('Z', '+00:00')).date()
-                    days_diff = (settlement_date - today).days
-                    
-                    # Only consider options expiring today (0) or tomorrow (1) for same-day strategy
-                    if days_diff > 1:
-                        continue
-                        
-                except (ValueError, TypeError):
-                    # If we can't parse the date, skip this option
-                    continue
             
-            strike_price = float(product.get('strike_price', 0))
-            if strike_price == 0:
-                continue
+            settlement = option.settlement
+            if settlement is not None:
+                # The product list is cached, so it can still hold a just-expired contract
+                if settlement <= now:
+                    continue
+                # Only consider options expiring today (0) or tomorrow (1) for same-day strategy
+                if (settlement.date() - today).days > 1:
+                    continue
                 
-            diff = abs(strike_price - spot_price)
-            
-            # Find closest call option
-            if product['contract_type'] == 'call_options' and diff < min_call_diff:
-                min_call_diff = diff
-                call_option = {
-                    'id': product['id'],
-                    'symbol': product['symbol'],
-                    'strike_price': strike_price,
-                    'contract_type': 'call_options'
-                }
-            
-            # Find closest put option
-            elif product['contract_type'] == 'put_options' and diff < min_put_diff:
-                min_put_diff = diff
-                put_option = {
-                    'id': product['id'],
-                    'symbol': product['symbol'],
-                    'strike_price': strike_price,
-                    'contract_type': 'put_options'
-                }
-        
-        return {'call': call_option, 'put': put_option}
-    
-    async def get_option_premium(self, product_id: int) -> float:
+            diff = abs(option.strike_price - spot_price)
+            if diff < min_diff[contract_type]:
+                min_diff[contract_type] = diff
+                best[contract_type] = option
+        
+        call_option, put_option = best['call_options'], best['put_options']
+        return {'call': call_option.as_option() if call_option else None,
+                'put': put_option.as_option() if put_option else None}
+    
+    async def get_option_premium(self, product_id: int, product_symbol: str = None) -> float:
         """Get current premium/mark price for an option"""
         try:
-            # Get product details to find symbol
-            products = await self._make_request('GET', '/products')
-            if not products.get('success'):
-                return 0.0
+            if not product_symbol:
+                # Resolve the symbol from the parsed option rows before paying for /products
+                option = self._options_by_id.get(product_id)
+                if option:
+                    product_symbol = option.symbol
+            
+            if not product_symbol:
+                products = await self._make_request('GET', '/products')
+                if not products.get('success'):
+                    return 0.0
                 
-            product_symbol = None
-            for product in products['result']:
-                if product['id'] == product_id:
-                    product_symbol = product['symbol']
-                    break
+                for product in products['result']:
+                    if product['id'] == product_id:
+                        product_symbol = product['symbol']
+                        break
                     
             if not product_symbol:
                 return 0.0
@@ -266,7 +508,7 @@ class DeltaExchangeClient:
             return 0.0
             
         except Exception as e:
-            logger.error(f"Failed to get option premium: {e}")
+            logger.error("Failed to get option premium: %s", e)
             return 0.0
     
     async def calculate_break_even_price(self, position_data: Dict, option_type: str) -> float:
@@ -283,11 +525,36 @@ class DeltaExchangeClient:
                 premium_collected = float(position_data['call'].get('premium_received', 0))
                 return strike_price + premium_collected
         except Exception as e:
-            logger.error(f"Failed to calculate break-even: {e}")
+            logger.error("Failed to calculate break-even: %s", e)
             return 0.0
     
+    async def _submit_order(self, data: Dict) -> Dict:
+        """Submit an order, resolving duplicate client order ids to the original order"""
+        client_order_id = data.get('client_order_id')
+        try:
+            result = await self._make_request('POST', '/orders', data=data)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if not client_order_id:
+                raise
+            # Safe to resubmit: the exchange rejects a second order with the same id
+            result = await self._make_request('POST', '/orders', data=data)
+        
+        # Only a duplicate-id rejection means an earlier attempt was already accepted;
+        # any other rejection (margin, price bands, ...) is reported as-is
+        if client_order_id and not result.get('success') and 'duplicate' in _error_message(result).lower():
+            try:
+                existing = await self.get_order_by_client_id(client_order_id)
+            except Exception as e:
+                logger.error("Lookup of order %s failed: %s", client_order_id, e)
+                return result
+            if existing.get('success'):
+                logger.info("Order %s already placed, reusing it", client_order_id)
+                return existing
+        return result
+    
     async def place_order(self, product_id: int, side: str, size: int, 
-                         order_type: str = "market_order", limit_price: str = None) -> Dict:
+                         order_type: str = "market_order", limit_price: str = None,
+                         client_order_id: str = None) -> Dict:
         """Place an order"""
         data = {
             'product_id': product_id,
@@ -297,11 +564,14 @@ class DeltaExchangeClient:
         }
         if limit_price:
             data['limit_price'] = limit_price
-        return await self._make_request('POST', '/orders', data=data)
+        if client_order_id:
+            data['client_order_id'] = client_order_id
+        return await self._submit_order(data)
     
     async def place_stop_order(self, product_id: int, side: str, size: int,
                               stop_price: str, order_type: str = "stop_limit_order",
-                              limit_price: str = None, current_premium: float = 0) -> Dict:
+                              limit_price: str = None, current_premium: float = 0,
+                              client_order_id: str = None) -> Dict:
         """Place a stop-loss order with proper validation"""
         try:
             # Validate stop price for options
@@ -311,7 +581,7 @@ class DeltaExchangeClient:
             if current_premium > 0:
                 # Ensure stop price is reasonable (not more than 5x current premium)
                 if stop_price_float > current_premium * 5:
-                    logger.warning(f"Stop price {stop_price_float} too high, adjusting to {current_premium * 2}")
+                    logger.warning("Stop price %s too high, adjusting to %s", stop_price_float, current_premium * 2)
                     stop_price = str(round(current_premium * 2, 2))
                     stop_price_float = current_premium * 2
             
@@ -334,18 +604,20 @@ class DeltaExchangeClient:
                 'limit_price': limit_price,
                 'time_in_force': 'GTC'  # Good Till Cancel
             }
+            if client_order_id:
+                data['client_order_id'] = client_order_id
             
-            logger.info(f"Placing stop order: {data}")
-            result = await self._make_request('POST', '/orders', data=data)
+            logger.info("Placing stop order: %s", data)
+            result = await self._submit_order(data)
             
             if not result.get('success'):
-                error_msg = result.get('error', {}).get('message', 'Unknown error')
-                logger.error(f"Stop order failed: {error_msg}")
+                error_msg = _error_message(result)
+                logger.error("Stop order failed: %s", error_msg)
                 
             return result
             
         except Exception as e:
-            logger.error(f"Failed to place stop order: {e}")
+            logger.error("Failed to place stop order: %s", e)
             return {'success': False, 'error': {'message': str(e)}}
 
 class TelegramBot:
@@ -356,25 +628,339 @@ class TelegramBot:
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
         self.delta_client = delta_client
         self.order_tracker = OrderTracker()
+        self.session = None
+        self._chat_queues: Dict[int, asyncio.Queue] = {}     # Per-chat ordered work queues
+        self._chat_workers: Dict[int, asyncio.Task] = {}     # Consumer task per chat queue
+        self._handler_sem = asyncio.Semaphore(20)            # Cap concurrently running handlers
+        self._spot_price = 0.0                               # Last fetched BTC spot price
+        self._spot_expires_at = 0.0                          # Monotonic expiry of _spot_price
+        self._spot_lock = asyncio.Lock()
+        self._spot_last_read = 0.0                           # Monotonic time of last spot read
+        self._spot_task: Optional[asyncio.Task] = None       # Background spot refresher
+        self._cache: Dict[str, Tuple[float, Dict]] = {}      # Key -> (monotonic fetch time, response)
+        self._inflight: Dict[str, asyncio.Task] = {}         # Key -> fetch currently in flight
+        self._background: set = set()                        # Fire-and-forget API calls in flight
+        self._last_press: Dict[Tuple[int, str], float] = {}  # (user id, callback data) -> monotonic time
+        self._send_limiter = TokenBucket(TELEGRAM_GLOBAL_RATE, int(TELEGRAM_GLOBAL_RATE))  # Bot-wide send pace
+        self._chat_limiters: Dict[int, TokenBucket] = {}     # Per-chat send pace
+        # Handler tables built from the module-level registrations
+        self._command_dispatch = {name: getattr(self, attr) for name, attr in _COMMANDS}
+        self._callback_dispatch = {data: getattr(self, attr) for data, attr in _CALLBACKS}
+        
+    def invalidate_caches(self, which: str = 'all'):
+        """Drop cached exchange data ('orders', 'spot' or 'all') after a write"""
+        if which in ('orders', 'all'):
+            self._cache.pop('orders', None)
+        if which in ('spot', 'all'):
+            self._spot_expires_at = 0.0
+    
+    async def _spot_refresh_loop(self):
+        """Keep the cached spot price warm while handlers keep reading it"""
+        while time.monotonic() - self._spot_last_read < SPOT_REFRESH_IDLE:
+            # Sleep first: the reader that started us is already fetching a fresh price
+            await asyncio.sleep(SPOT_REFRESH_INTERVAL)
+            spot_price = await self.delta_client.get_spot_price()
+            if spot_price > 0:
+                self._spot_price = spot_price
+                self._spot_expires_at = time.monotonic() + SPOT_CACHE_TTL
+    
+    async def _cached(self, key: str, fetch, ttl: float) -> Dict:
+        """Get a Delta response by key, coalescing concurrent and back-to-back callers"""
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh_cached(key, fetch))
+            self._inflight[key] = task
+        # Shield so one cancelled waiter doesn't cancel the fetch for everyone else
+        return await asyncio.shield(task)
+    
+    async def _refresh_cached(self, key: str, fetch) -> Dict:
+        """Run one fetch for a cache key and store successful responses"""
+        try:
+            result = await fetch()
+            if result.get('success'):
+                self._cache[key] = (time.monotonic(), result)
+            return result
+        except Exception as e:
+            logger.error("Failed to fetch %s: %s", key, e)
+            return {'success': False, 'error': {'message': str(e)}}
+        finally:
+            self._inflight.pop(key, None)
+    
+    async def _fetch_open_order_ids(self) -> Dict:
+        """Fetch open orders reduced to their ids, derived once per snapshot for every monitor"""
+        response = await self.delta_client.get_open_orders()
+        if not response.get('success'):
+            return response
+        return {'success': True, 'result': frozenset(map(itemgetter('id'), response.get('result', [])))}
+    
+    async def _get_spot_cached(self, ttl: float = SPOT_CACHE_TTL) -> float:
+        """Get BTC spot price, letting bursts of callers share one recent fetch"""
+        self._spot_last_read = time.monotonic()
+        if self._spot_task is None or self._spot_task.done():
+            self._spot_task = asyncio.create_task(self._spot_refresh_loop())
+        
+        if time.monotonic() < self._spot_expires_at:
+            return self._spot_price
+        
+        async with self._spot_lock:
+            # Another caller may have refreshed the price while we waited
+            if time.monotonic() < self._spot_expires_at:
+                return self._spot_price
+            
+            spot_price = await self.delta_client.get_spot_price()
+            if spot_price > 0:  # Never cache a failed fetch
+                self._spot_price = spot_price
+                self._spot_expires_at = time.monotonic() + ttl
+            return spot_price
+    
+    def is_repeat_press(self, user_id: int, callback_data: str) -> bool:
+        """Record a button press and report whether it repeats one inside PRESS_DEBOUNCE"""
+        now = time.monotonic()
+        key = (user_id, callback_data)
+        if now - self._last_press.get(key, 0.0) < PRESS_DEBOUNCE:
+            return True
+        # Prune stale presses occasionally so the table stays bounded by active users
+        if len(self._last_press) >= 1024:
+            self._last_press = {k: t for k, t in self._last_press.items() if now - t < PRESS_DEBOUNCE}
+        self._last_press[key] = now
+        return False
+    
+    async def _throttle_send(self, chat_id: int):
+        """Wait for Telegram's per-chat and bot-wide send allowances"""
+        limiter = self._chat_limiters.get(chat_id)
+        if limiter is None:
+            if len(self._chat_limiters) >= 1024:
+                self._chat_limiters = {cid: b for cid, b in self._chat_limiters.items() if not b.is_idle()}
+            limiter = TokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST)
+            self._chat_limiters[chat_id] = limiter
+        await limiter.acquire()
+        await self._send_limiter.acquire()
+    
+    def spawn(self, coro) -> None:
+        """Run a self-contained API call in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+    
+    def enqueue(self, chat_id: int, coro) -> bool:
+        """Queue work for a chat: ordered within the chat, concurrent across chats"""
+        queue = self._chat_queues.get(chat_id)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=CHAT_QUEUE_MAXSIZE)
+            self._chat_queues[chat_id] = queue
+            self._chat_workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id, queue))
+        try:
+            queue.put_nowait(coro)
+        except asyncio.QueueFull:
+            # A chat flooding updates faster than they drain sheds the excess instead of
+            # growing memory without bound
+            coro.close()
+            logger.warning("Chat %s has %s pending updates, dropping one", chat_id, queue.qsize())
+            return False
+        return True
+    
+    async def _chat_worker(self, chat_id: int, queue: asyncio.Queue):
+        """Run queued work for one chat until the queue has been idle too long"""
+        try:
+            while True:
+                try:
+                    coro = await asyncio.wait_for(queue.get(), timeout=CHAT_QUEUE_IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                try:
+                    async with self._handler_sem:
+                        await coro
+                except Exception as e:
+                    await self._reply_error(chat_id, "Request failed", e)
+        finally:
+            self._chat_queues.pop(chat_id, None)
+            self._chat_workers.pop(chat_id, None)
+    
+    def is_command(self, text: str) -> bool:
+        """Whether text is one of the registered commands"""
+        return text in self._command_dispatch
+    
+    async def handle_command(self, chat_id: int, text: str):
+        """Handle a text command"""
+        handler = self._command_dispatch.get(text)
+        if handler:
+            await handler(chat_id)
+    
+    async def _start_command(self, chat_id: int):
+        """Send the welcome text and main menu"""
+        await self.send_message(chat_id, _WELCOME_TEXT, _MAIN_MENU_MARKUP)
+    
+    async def _help_command(self, chat_id: int):
+        """Send the command list"""
+        await self.send_message(chat_id, _HELP_TEXT, parse_mode=None)
+    
+    async def _status_command(self, chat_id: int):
+        """Send bot status with the current BTC price"""
+        await self._reply_with_placeholder(chat_id, self._render_status(),
+                                           ready=time.monotonic() < self._spot_expires_at)
+    
+    async def _render_status(self) -> str:
+        """Build the /status text, fetching the spot price if the cache is cold"""
+        spot_price = await self._get_spot_cached()
+        active_count = 0
+        for pos in self.order_tracker.active_positions.values():
+            if pos['status'] in _LIVE_STATUSES:
+                active_count += 1
+        return _STATUS_TEMPLATE.format(spot=spot_price, active=active_count, now=datetime.now())
+    
+    async def _reply_with_placeholder(self, chat_id: int, render, ready: bool):
+        """Reply with rendered text; on a cold cache show a placeholder first and edit it in place"""
+        if ready:
+            await self.send_message(chat_id, await render)
+            return
+        
+        # The placeholder goes out while the data is still being fetched
+        placeholder_id, text = await asyncio.gather(
+            self.send_placeholder(chat_id, _LOADING_TEXT), render)
+        if placeholder_id is None or not await self.edit_message(chat_id, placeholder_id, text):
+            await self.send_message(chat_id, text)
+    
+    async def _positions_command(self, chat_id: int):
+        """Send the detailed position listing"""
+        positions_text = self.format_positions()
+        await self.send_message(chat_id, positions_text)
+    
+    async def handle_callback(self, chat_id: int, callback_data: str):
+        """Handle an inline keyboard button press"""
+        handler = self._callback_dispatch.get(callback_data)
+        if handler:
+            await handler(chat_id)
+        else:
+            await self.send_message(chat_id, _UNKNOWN_ACTION_TEXT, parse_mode=None)
+    
+    async def _execute_straddle_callback(self, chat_id: int):
+        """Run the short straddle and report the result"""
+        await self.send_message(chat_id, _EXECUTING_TEXT, parse_mode=None)
+        result = await self.execute_short_straddle(chat_id)
+        await self.send_message(chat_id, result)
+    
+    async def _check_positions_callback(self, chat_id: int):
+        """Send the compact position summary"""
+        positions_text = self.format_positions(compact=True)
+        await self.send_message(chat_id, positions_text)
+        
+    def format_positions(self, compact: bool = False) -> str:
+        """Format tracked positions for a listing"""
+        # Render only the newest rows (the tracker never forgets positions), oldest first
+        tracked = self.order_tracker.active_positions
+        if not tracked:
+            return _EMPTY_POSITIONS_TEXT[compact]
+        newest = list(islice(reversed(tracked.items()), POSITIONS_RENDER_LIMIT))
+        positions = dict(reversed(newest))
+        return _format_positions(positions, compact, len(tracked) - len(positions))
+    
+    async def _get_session(self):
+        if self.session is None or self.session.closed:
+            # Reused for every Bot API call so the TLS connection to Telegram stays warm;
+            # sized for a burst of replies and acks across chats without queueing on the pool
+            connector = aiohttp.TCPConnector(limit=64, limit_per_host=64, keepalive_timeout=60,
+                                             ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10, connect=5, sock_read=7),
+                json_serialize=_json_dumps  # Bot API request bodies go through orjson too
+            )
+        return self.session
+    
+    async def close(self):
+        """Release resources held by the bot"""
+        for worker in self._chat_workers.values():
+            worker.cancel()
+        if self._spot_task:
+            self._spot_task.cancel()
+        for task in self._background:
+            task.cancel()
+        if self.session:
+            await self.session.close()
         
+    async def _reply_error(self, chat_id: int, title: str, exc: Exception):
+        """Log a failure once and tell the chat about it"""
+        # Handler failures are bugs or unexpected exchange states: keep the traceback
+        logger.error("%s (chat %s): %s", title, chat_id, exc, exc_info=exc)
+        # Plain text: exception messages may contain characters the HTML parser rejects
+        await self.send_message(chat_id, _ERROR_TEMPLATE.format(title=title, detail=exc), parse_mode=None)
+    
     async def send_message(self, chat_id: int, text: str, 
-                          reply_markup: Dict = None) -> bool:
-        """Send message to Telegram chat"""
+                          reply_markup: Any = None, parse_mode: Optional[str] = 'HTML') -> bool:
+        """Send message to Telegram chat (parse_mode=None sends plain text)"""
+        url = f"{self.base_url}/sendMessage"
+        data = {
+            'chat_id': chat_id,
+            'text': text
+        }
+        if parse_mode:
+            data['parse_mode'] = parse_mode
+        if reply_markup:
+            data['reply_markup'] = reply_markup if isinstance(reply_markup, str) else _json_dumps(reply_markup)
+        
+        try:
+            await self._throttle_send(chat_id)
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.error("Failed to send message: %s", e)
+            return False
+    
+    async def send_placeholder(self, chat_id: int, text: str) -> Optional[int]:
+        """Send a plain-text placeholder and return its message id for a later edit"""
         url = f"{self.base_url}/sendMessage"
+        try:
+            await self._throttle_send(chat_id)
+            session = await self._get_session()
+            async with session.post(url, json={'chat_id': chat_id, 'text': text}) as response:
+                if response.status != 200:
+                    return None
+                return orjson.loads(await response.read())['result']['message_id']
+        except Exception as e:
+            logger.error("Failed to send placeholder: %s", e)
+            return None
+    
+    async def edit_message(self, chat_id: int, message_id: int, text: str,
+                           reply_markup: Any = None, parse_mode: Optional[str] = 'HTML') -> bool:
+        """Replace the text of a message the bot sent earlier"""
+        url = f"{self.base_url}/editMessageText"
         data = {
             'chat_id': chat_id,
-            'text': text,
-            'parse_mode': 'HTML'
+            'message_id': message_id,
+            'text': text
         }
+        if parse_mode:
+            data['parse_mode'] = parse_mode
         if reply_markup:
-            data['reply_markup'] = json.dumps(reply_markup)
+            data['reply_markup'] = reply_markup if isinstance(reply_markup, str) else _json_dumps(reply_markup)
+        
+        try:
+            await self._throttle_send(chat_id)
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                return response.status == 200
+        except Exception as e:
+            logger.error("Failed to edit message: %s", e)
+            return False
+    
+    async def answer_callback_query(self, callback_query_id: str, text: str = None) -> bool:
+        """Acknowledge an inline button press"""
+        url = f"{self.base_url}/answerCallbackQuery"
+        data = {'callback_query_id': callback_query_id}
+        if text:
+            data['text'] = text
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data) as response:
-                    return response.status == 200
+            session = await self._get_session()
+            async with session.post(url, json=data) as response:
+                return response.status == 200
         except Exception as e:
-            logger.error(f"Failed to send message: {e}")
+            logger.error("Failed to answer callback query: %s", e)
             return False
     
     async def monitor_stop_orders(self, position_id: str, chat_id: int):
@@ -390,22 +976,37 @@ class TelegramBot:
             while position_data['status'] == 'active':
                 await asyncio.sleep(30)  # Check every 30 seconds
                 
-                # Check call stop-loss status
-                if call_stop_id:
-                    call_stop_status = await self.delta_client.get_order_status(call_stop_id)
-                    if call_stop_status.get('success') and call_stop_status['result'].get('state') == 'filled':
-                        await self.handle_stop_triggered(position_id, 'call', chat_id)
-                        break
+                # One shared open-orders snapshot covers every monitored position;
+                # only stops that have left the book need an individual status check
+                open_orders = await self._cached('orders', self._fetch_open_order_ids, ORDERS_CACHE_TTL)
+                open_ids = open_orders['result'] if open_orders.get('success') else frozenset()
+                
+                # Look up both departed stops at once (call first, as before)
+                departed = [(leg, stop_id) for leg, stop_id in (('call', call_stop_id), ('put', put_stop_id))
+                            if stop_id and stop_id not in open_ids]
+                if not departed:
+                    continue
                 
-                # Check put stop-loss status  
-                if put_stop_id:
-                    put_stop_status = await self.delta_client.get_order_status(put_stop_id)
-                    if put_stop_status.get('success') and put_stop_status['result'].get('state') == 'filled':
-                        await self.handle_stop_triggered(position_id, 'put', chat_id)
+                # A failed check (e.g. request timeout) is retried next pass rather than ending the monitor
+                statuses = await asyncio.gather(
+                    *(self.delta_client.get_order_status(stop_id) for _, stop_id in departed),
+                    return_exceptions=True
+                )
+                triggered = None
+                for (leg, stop_id), status in zip(departed, statuses):
+                    if isinstance(status, Exception):
+                        logger.warning("Status check for stop order %s failed, retrying: %s", stop_id, status)
+                        continue
+                    if status.get('success') and status['result'].get('state') == 'filled':
+                        triggered = leg
                         break
+                
+                if triggered:
+                    await self.handle_stop_triggered(position_id, triggered, chat_id)
+                    break
                         
         except Exception as e:
-            logger.error(f"Error monitoring stop orders: {e}")
+            logger.exception("Error monitoring stop orders: %s", e)
     
     async def handle_stop_triggered(self, position_id: str, triggered_option: str, chat_id: int):
         """Handle stop-loss trigger and adjust remaining position to break-even"""
@@ -424,21 +1025,27 @@ class TelegramBot:
             )
             
             # Determine remaining option
-            remaining_option = 'put' if triggered_option == 'call' else 'call'
+            remaining_option = _OTHER_LEG[triggered_option]
             remaining_data = position_data[remaining_option]
             
+            # Progress notes ride along with the final outcome instead of each taking a
+            # message (and a slot of the chat's send allowance) of their own
+            notes = []
+            
             # Cancel existing stop-loss for remaining option
+            remaining_product_id = remaining_data['product_id']
             remaining_stop_id = remaining_data.get('stop_order_id')
             if remaining_stop_id:
                 cancel_result = await self.delta_client.cancel_order(
                     remaining_stop_id, 
-                    remaining_data['product_id']
+                    remaining_product_id
                 )
+                self.invalidate_caches('orders')
                 
                 if cancel_result.get('success'):
-                    await self.send_message(chat_id, f"✅ Cancelled existing {remaining_option} stop-loss")
+                    notes.append(f"✅ Cancelled existing {remaining_option} stop-loss\n\n")
                 else:
-                    await self.send_message(chat_id, f"⚠️ Failed to cancel {remaining_option} stop-loss")
+                    notes.append(f"⚠️ Failed to cancel {remaining_option} stop-loss\n\n")
             
             # Calculate break-even price for remaining position
             break_even_price = await self.delta_client.calculate_break_even_price(
@@ -448,161 +1055,151 @@ class TelegramBot:
             if break_even_price > 0:
                 # Place new stop-loss at break-even price
                 new_stop_result = await self.delta_client.place_stop_order(
-                    product_id=remaining_data['product_id'],
+                    product_id=remaining_product_id,
                     side='buy',  # Buy to close short position
                     size=1,
                     stop_price=str(break_even_price),
                     order_type='stop_limit_order',
-                    limit_price=str(break_even_price * 1.01)  # 1% slippage for execution
+                    limit_price=str(break_even_price * 1.01),  # 1% slippage for execution
+                    client_order_id=_client_order_id(chat_id, position_id, f"{remaining_option[0]}be")
                 )
                 
                 if new_stop_result.get('success'):
+                    self.invalidate_caches('orders')
+                    
                     # Update position data
-                    position_data[remaining_option]['stop_order_id'] = new_stop_result['result']['id']
-                    position_data[remaining_option]['break_even_stop'] = break_even_price
+                    remaining_data['stop_order_id'] = new_stop_result['result']['id']
+                    remaining_data['break_even_stop'] = break_even_price
                     position_data['status'] = 'break_even_adjusted'
                     
-                    await self.send_message(
-                        chat_id,
+                    notes.append(
                         f"✅ <b>Break-Even Adjustment Complete!</b>\n\n"
                         f"🎯 New {remaining_option.upper()} stop-loss set at: ${break_even_price:.2f}\n"
                         f"💡 Position now protected at break-even level\n"
                         f"📊 Risk minimized successfully!"
                     )
                 else:
-                    await self.send_message(
-                        chat_id,
-                        f"❌ Failed to set break-even stop: {new_stop_result.get('error', {}).get('message', 'Unknown error')}"
-                    )
+                    error_msg = _error_message(new_stop_result)
+                    notes.append(f"❌ Failed to set break-even stop: {_esc(error_msg)}")
             else:
-                await self.send_message(chat_id, "❌ Could not calculate break-even price")
+                notes.append(_NO_BREAK_EVEN_TEXT)
+            
+            await self.send_message(chat_id, "".join(notes))
                 
         except Exception as e:
-            logger.error(f"Error handling stop trigger: {e}")
-            await self.send_message(chat_id, f"❌ Error adjusting position: {str(e)}")
+            await self._reply_error(chat_id, "Error adjusting position", e)
+    
+    async def _open_short_leg(self, chat_id: int, position_id: str, leg: str,
+                              option: Dict, results: List[str]) -> Dict:
+        """Sell one straddle leg (1 lot) and protect it with a stop-loss"""
+        label = leg.capitalize()
+        product_id = option['id']
+        leg_data = {'product_id': product_id, 'strike_price': option.get('strike_price', 0)}
+        
+        order_result = await self.delta_client.place_order(
+            product_id=product_id,
+            side='sell',
+            size=1,
+            order_type='market_order',
+            client_order_id=_client_order_id(chat_id, position_id, leg[0])
+        )
+        
+        if not order_result.get('success'):
+            error_msg = _error_message(order_result)
+            # Exchange error text lands in an HTML message; escape anything tag-like
+            results.append(_LEG_FAILED_TMPL.format(label=label, error=_esc(error_msg)))
+            return leg_data
+        
+        # Get current premium for the sold option
+        premium = await self.delta_client.get_option_premium(product_id, option['symbol'])
+        if premium == 0:
+            premium = 100  # Fallback minimum premium
+        
+        leg_data.update({
+            'order_id': order_result['result']['id'],
+            'premium_received': premium
+        })
+        results.append(_LEG_SOLD_TMPL.format(label=label, symbol=_esc(option['symbol']), premium=premium))
+        
+        # Calculate reasonable stop-loss (25% above premium or minimum 50 points)
+        stop_price = max(premium * 1.25, premium + 50)
+        
+        # Place stop-loss with validation
+        stop_result = await self.delta_client.place_stop_order(
+            product_id=product_id,
+            side='buy',  # Buy to close short position
+            size=1,
+            stop_price=str(round(stop_price, 1)),
+            order_type='stop_limit_order',
+            current_premium=premium,
+            client_order_id=_client_order_id(chat_id, position_id, f"{leg[0]}sl")
+        )
+        
+        if stop_result.get('success'):
+            leg_data['stop_order_id'] = stop_result['result']['id']
+            leg_data['stop_price'] = stop_price
+            results.append(_LEG_STOP_TMPL.format(label=label, stop=stop_price))
+        else:
+            error_msg = _error_message(stop_result)
+            results.append(_LEG_STOP_FAILED_TMPL.format(label=label, error=_esc(error_msg)))
+        
+        return leg_data
     
     async def execute_short_straddle(self, chat_id: int) -> str:
         """Execute short straddle strategy with improved stop-loss handling"""
         try:
             position_id = f"straddle_{int(time.time())}"
             
-            # Get BTC spot price
-            spot_price = await self.delta_client.get_spot_price()
+            # Spot price and the option chain are independent reads: fetch them together
+            spot_price, options = await asyncio.gather(
+                self._get_spot_cached(),
+                self.delta_client.get_option_products(),
+                return_exceptions=True
+            )
+            if isinstance(spot_price, Exception):
+                raise spot_price
             if spot_price == 0:
-                return "❌ Failed to get BTC spot price"
+                return _NO_SPOT_TEXT
+            if isinstance(options, Exception):
+                logger.error("Failed to get option products: %s", options)
+                options = None
             
             await self.send_message(chat_id, f"📊 BTC Spot Price: ${spot_price:,.2f}")
+            if options is None:
+                return _NO_ATM_OPTIONS_TEXT
             
-            # Find ATM options
-            atm_options = await self.delta_client.find_atm_options(spot_price)
+            atm_options = self.delta_client._find_closest_expiry_options(options, spot_price)
             call_option = atm_options['call']
             put_option = atm_options['put']
             
             if not call_option or not put_option:
-                return "❌ No ATM options found for short-term expiry\n\n💡 BTC options may not be available for same-day trading"
+                return _NO_ATM_OPTIONS_TEXT
             
             await self.send_message(chat_id, 
                 f"🎯 Found ATM Options:\n"
-                f"📞 Call: {call_option['symbol']} (Strike: ${call_option['strike_price']})\n"
-                f"📞 Put: {put_option['symbol']} (Strike: ${put_option['strike_price']})"
+                f"📞 Call: {_esc(call_option['symbol'])} (Strike: ${call_option['strike_price']})\n"
+                f"📞 Put: {_esc(put_option['symbol'])} (Strike: ${put_option['strike_price']})"
             )
             
-            # Execute short straddle
-            results = []
-            call_data = {'product_id': call_option['id'], 'strike_price': call_option.get('strike_price', 0)}
-            put_data = {'product_id': put_option['id'], 'strike_price': put_option.get('strike_price', 0)}
-            
-            # Sell Call Option (1 lot)
-            call_result = await self.delta_client.place_order(
-                product_id=call_option['id'],
-                side='sell',
-                size=1,
-                order_type='market_order'
+            # Sell both legs concurrently: halves the wait and narrows the legging window.
+            # Each leg reports into its own list so the summary keeps call-then-put order.
+            call_results, put_results = [], []
+            call_data, put_data = await asyncio.gather(
+                self._open_short_leg(chat_id, position_id, 'call', call_option, call_results),
+                self._open_short_leg(chat_id, position_id, 'put', put_option, put_results),
+                return_exceptions=True
             )
+            # A leg that raised must not drop the other (possibly filled) leg from tracking
+            if isinstance(call_data, Exception):
+                call_results.append(_LEG_FAILED_TMPL.format(label='Call', error=_esc(call_data)))
+                call_data = {'product_id': call_option['id'], 'strike_price': call_option.get('strike_price', 0)}
+            if isinstance(put_data, Exception):
+                put_results.append(_LEG_FAILED_TMPL.format(label='Put', error=_esc(put_data)))
+                put_data = {'product_id': put_option['id'], 'strike_price': put_option.get('strike_price', 0)}
+            results = call_results + put_results
             
-            if call_result.get('success'):
-                call_order = call_result['result']
-                
-                # Get current premium for call option
-                call_premium = await self.delta_client.get_option_premium(call_option['id'])
-                if call_premium == 0:
-                    call_premium = 100  # Fallback minimum premium
-                
-                call_data.update({
-                    'order_id': call_order['id'],
-                    'premium_received': call_premium
-                })
-                results.append(f"✅ Call Option Sold: {call_option['symbol']} @ ${call_premium:.1f}")
-                
-                # Calculate reasonable stop-loss (25% above premium or minimum 50 points)
-                call_stop_price = max(call_premium * 1.25, call_premium + 50)
-                
-                # Place stop-loss for call with validation
-                stop_result = await self.delta_client.place_stop_order(
-                    product_id=call_option['id'],
-                    side='buy',  # Buy to close short position
-                    size=1,
-                    stop_price=str(round(call_stop_price, 1)),
-                    order_type='stop_limit_order',
-                    current_premium=call_premium
-                )
-                
-                if stop_result.get('success'):
-                    call_data['stop_order_id'] = stop_result['result']['id']
-                    call_data['stop_price'] = call_stop_price
-                    results.append(f"🛡️ Call Stop-Loss placed at ${call_stop_price:.1f}")
-                else:
-                    error_msg = stop_result.get('error', {}).get('message', 'Unknown error')
-                    results.append(f"⚠️ Call Stop-Loss failed: {error_msg}")
-            else:
-                error_msg = call_result.get('error', {}).get('message', 'Unknown error')
-                results.append(f"❌ Call Option failed: {error_msg}")
-            
-            # Sell Put Option (1 lot)
-            put_result = await self.delta_client.place_order(
-                product_id=put_option['id'],
-                side='sell',
-                size=1,
-                order_type='market_order'
-            )
-            
-            if put_result.get('success'):
-                put_order = put_result['result']
-                
-                # Get current premium for put option
-                put_premium = await self.delta_client.get_option_premium(put_option['id'])
-                if put_premium == 0:
-                    put_premium = 100  # Fallback minimum premium
-                
-                put_data.update({
-                    'order_id': put_order['id'],
-                    'premium_received': put_premium
-                })
-                results.append(f"✅ Put Option Sold: {put_option['symbol']} @ ${put_premium:.1f}")
-                
-                # Calculate reasonable stop-loss
-                put_stop_price = max(put_premium * 1.25, put_premium + 50)
-                
-                # Place stop-loss for put
-                stop_result = await self.delta_client.place_stop_order(
-                    product_id=put_option['id'],
-                    side='buy',
-                    size=1,
-                    stop_price=str(round(put_stop_price, 1)),
-                    order_type='stop_limit_order',
-                    current_premium=put_premium
-                )
-                
-                if stop_result.get('success'):
-                    put_data['stop_order_id'] = stop_result['result']['id']
-                    put_data['stop_price'] = put_stop_price
-                    results.append(f"🛡️ Put Stop-Loss placed at ${put_stop_price:.1f}")
-                else:
-                    error_msg = stop_result.get('error', {}).get('message', 'Unknown error')
-                    results.append(f"⚠️ Put Stop-Loss failed: {error_msg}")
-            else:
-                error_msg = put_result.get('error', {}).get('message', 'Unknown error')
-                results.append(f"❌ Put Option failed: {error_msg}")
+            # New legs and stops must show up on the next open-orders read
+            self.invalidate_caches('orders')
             
             # Track the position for monitoring
             self.order_tracker.add_position(position_id, call_data, put_data)
@@ -619,8 +1216,8 @@ class TelegramBot:
             return "\n".join(results)
             
         except Exception as e:
-            logger.error(f"Short straddle execution failed: {e}")
-            return f"❌ Strategy execution failed: {str(e)}"
+            logger.exception("Short straddle execution failed: %s", e)
+            return f"❌ Strategy execution failed: {_esc(e)}"
 
 # Global instances
 delta_client = None
@@ -628,100 +1225,51 @@ telegram_bot = None
 
 async def handle_webhook(request: Request) -> Response:
     """Handle Telegram webhook"""
+    bot = telegram_bot
     try:
-        data = await request.json()
-        logger.info(f"Received webhook: {data}")
+        data = orjson.loads(await request.read())
+        # Full update dumps are only worth rendering when INFO is actually emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Received webhook: %s", data)
+        
+        # Updates are probed by shape rather than indexed blindly, so the routine
+        # non-text ones (stickers, inline-message buttons, ...) never take the exception path
+        message = data.get('message')
+        callback = data.get('callback_query')
         
-        if 'message' in data:
-            message = data['message']
+        if message is not None:
+            text = message.get('text')
+            # Free text has no handler: don't spend a queue slot (or start a chat worker) on it
+            if not text or not bot.is_command(text):
+                return json_response({'status': 'ok'})
             chat_id = message['chat']['id']
-            text = message.get('text', '')
-            
-            if text == '/start':
-                keyboard = {
-                    'inline_keyboard': [[
-                        {'text': '🚀 Execute Short Straddle', 'callback_data': 'execute_straddle'}
-                    ], [
-                        {'text': '📊 Check Positions', 'callback_data': 'check_positions'}
-                    ]]
-                }
-                await telegram_bot.send_message(
-                    chat_id,
-                    "🤖 <b>Enhanced BTC Short Straddle Bot</b>\n\n"
-                    "This bot executes a short straddle strategy with smart risk management:\n"
-                    "• Sells 1 lot ATM Call & Put options\n"
-                    "• Places 25% premium stop-loss orders\n"
-                    "• <b>Auto break-even adjustment</b> when one stop triggers\n"
-                    "• Continuous position monitoring\n\n"
-                    "Click below to get started:",
-                    keyboard
-                )
-            elif text == '/help':
-                await telegram_bot.send_message(
-                    chat_id,
-                    "📋 <b>Enhanced Bot Commands:</b>\n\n"
-                    "/start - Show main menu\n"
-                    "/help - Show this help message\n"
-                    "/status - Check bot status\n"
-                    "/positions - View active positions\n\n"
-                    "<b>Smart Features:</b>\n"
-                    "🎯 Auto break-even adjustment\n"
-                    "📊 Real-time position monitoring\n"
-                    "🛡️ Advanced risk management\n"
-                    "⚡ Instant stop-loss notifications"
-                )
-            elif text == '/status':
-                spot_price = await delta_client.get_spot_price()
-                active_count = len([p for p in telegram_bot.order_tracker.active_positions.values() 
-                                 if p['status'] in ['active', 'adjusting', 'break_even_adjusted']])
-                await telegram_bot.send_message(
-                    chat_id,
-                    f"✅ <b>Enhanced Bot Status: Active</b>\n\n"
-                    f"🔗 Connected to Delta Exchange India\n"
-                    f"📊 Current BTC Price: ${spot_price:,.2f}\n"
-                    f"📈 Active Positions: {active_count}\n"
-                    f"🤖 Monitoring Tasks Running\n"
-                    f"⏰ Last Update: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}"
-                )
-            elif text == '/positions':
-                positions_text = "📊 <b>Active Positions:</b>\n\n"
-                if not telegram_bot.order_tracker.active_positions:
-                    positions_text += "No active positions"
-                else:
-                    for pid, pos in telegram_bot.order_tracker.active_positions.items():
-                        positions_text += f"🆔 {pid}\n"
-                        positions_text += f"📍 Status: {pos['status']}\n"
-                        positions_text += f"⏰ Created: {pos['created_at'].strftime('%H:%M:%S')}\n"
-                        if pos.get('stop_triggered'):
-                            positions_text += f"🚨 Stop Triggered: {pos['stop_triggered'].upper()}\n"
-                        positions_text += "━━━━━━━━━━━━━━\n"
-                        
-                await telegram_bot.send_message(chat_id, positions_text)
-        
-        elif 'callback_query' in data:
-            callback = data['callback_query']
-            chat_id = callback['message']['chat']['id']
-            callback_data = callback['data']
-            
-            if callback_data == 'execute_straddle':
-                await telegram_bot.send_message(chat_id, "⚡ Executing Enhanced Short Straddle Strategy...")
-                result = await telegram_bot.execute_short_straddle(chat_id)
-                await telegram_bot.send_message(chat_id, result)
-            elif callback_data == 'check_positions':
-                positions_text = "📊 <b>Position Summary:</b>\n\n"
-                if not telegram_bot.order_tracker.active_positions:
-                    positions_text += "No active positions"
-                else:
-                    for pid, pos in telegram_bot.order_tracker.active_positions.items():
-                        positions_text += f"🆔 {pid[:12]}...\n"
-                        positions_text += f"📍 {pos['status']}\n━━━━━━━━━━━━━━\n"
-                        
-                await telegram_bot.send_message(chat_id, positions_text)
+            
+            # Reply work runs on the chat queue so Telegram gets its 200 OK immediately
+            bot.enqueue(chat_id, bot.handle_command(chat_id, text))
+        
+        elif callback is not None:
+            callback_message = callback.get('message')
+            callback_data = callback.get('data')
+            if callback_message is None or callback_data is None:
+                # Nothing to route (e.g. an inline-mode or game button); just stop the spinner
+                bot.spawn(bot.answer_callback_query(callback['id']))
+                return json_response({'status': 'ok'})
+            chat_id = callback_message['chat']['id']
+            
+            # A double tap must not re-run the handler (e.g. sell a second straddle)
+            if bot.is_repeat_press(callback['from']['id'], callback_data):
+                bot.spawn(bot.answer_callback_query(callback['id'], _REPEAT_PRESS_TOAST))
+                return json_response({'status': 'ok'})
+            
+            # Long handlers (e.g. straddle execution) must not hold up other chats
+            accepted = bot.enqueue(chat_id, bot.handle_callback(chat_id, callback_data))
+            # Acknowledge in parallel with the handler's own sends; neither waits on the other
+            bot.spawn(bot.answer_callback_query(callback['id'], None if accepted else _BUSY_TOAST))
         
         return json_response({'status': 'ok'})
         
     except Exception as e:
-        logger.error(f"Webhook error: {e}")
+        logger.exception("Webhook error: %s", e)
         return json_response({'status': 'error', 'message': str(e)})
 
 async def health_check(request: Request) -> Response:
@@ -753,15 +1301,16 @@ async def init_app() -> web.Application:
     # Set webhook if URL provided
     if webhook_url:
         webhook_endpoint = f"{webhook_url}/webhook"
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"https://api.telegram.org/bot{bot_token}/setWebhook",
-                json={'url': webhook_endpoint}
-            ) as response:
-                if response.status == 200:
-                    logger.info(f"Webhook set successfully: {webhook_endpoint}")
-                else:
-                    logger.warning(f"Failed to set webhook: {response.status}")
+        # Register through the bot's pooled session so its connection is reused for replies
+        session = await telegram_bot._get_session()
+        async with session.post(
+            f"{telegram_bot.base_url}/setWebhook",
+            json={'url': webhook_endpoint}
+        ) as response:
+            if response.status == 200:
+                logger.info("Webhook set successfully: %s", webhook_endpoint)
+            else:
+                logger.warning("Failed to set webhook: %s", response.status)
     
     # Create web application
     app = web.Application()
@@ -773,6 +1322,10 @@ async def init_app() -> web.Application:
 
 async def main():
     """Main function"""
+    # Bound the default executor so asyncio.to_thread work can't spawn a thread per burst
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=BLOCKING_POOL_WORKERS, thread_name_prefix='blocking'))
+    
     app = await init_app()
     
     # Get port from environment
@@ -785,7 +1338,7 @@ async def main():
     site = web.TCPSite(runner, '0.0.0.0', port)
     await site.start()
     
-    logger.info(f"🚀 Enhanced BTC Short Straddle Bot started on port {port}")
+    logger.info("🚀 Enhanced BTC Short Straddle Bot started on port %s", port)
     logger.info("🤖 Smart risk management and break-even adjustment active!")
     
     # Keep the server running
@@ -795,8 +1348,38 @@ async def main():
         logger.info("Shutting down...")
     finally:
         await runner.cleanup()
-        if delta_client and delta_client.session:
-            await delta_client.session.close()
+        if telegram_bot:
+            await telegram_bot.close()
+        if delta_client:
+            await delta_client.close()
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Log formatter that renders asctime with one strftime per second instead of per record"""
+    
+    def __init__(self, fmt: str):
+        super().__init__(fmt)
+        self._second = None     # Whole second the cached text was rendered for
+        self._second_text = ''
+        
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        second = int(record.created)
+        if second != self._second:
+            self._second_text = time.strftime('%Y-%m-%d %H:%M:%S', self.converter(record.created))
+            self._second = second
+        # Same shape as logging's default asctime, e.g. '2024-01-01 12:00:00,123'
+        return f"{self._second_text},{int(record.msecs):03d}"
+
+def configure_logging():
+    """Install the root log handler once; a no-op if the host process already configured logging"""
+    if logging.getLogger().handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(_CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
 
 if __name__ == '__main__':
-    asyncio.run(main())
+    configure_logging()
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())